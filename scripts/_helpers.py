@@ -390,7 +390,15 @@ def aggregate_costs(n, flatten=False, opts=None, existing_only=False):
 
 
 def progress_retrieve(
-    url, file, data=None, headers=None, disable_progress=False, roundto=1.0
+    url,
+    file,
+    data=None,
+    headers=None,
+    disable_progress=False,
+    roundto=1.0,
+    session=None,
+    chunk_size=64 * 1024,
+    timeout=None,
 ):
     """
     Function to download data from a url with a progress bar progress in
@@ -400,17 +408,29 @@ def progress_retrieve(
     ----------
     url : str
         Url to download data from
-    file : str
-        File where to save the output
+    file : str or file-like
+        File where to save the output; when a session is used, a writable
+        binary file object is also accepted
     data : dict
         Data for the request (default None), when not none Post method is used
+    headers : list
+        List of (header, value) tuples to add to the request (default None)
     disable_progress : bool
         When true, no progress bar is shown
     roundto : float
         (default 0) Precision used to report the progress
         e.g. 0.1 stands for 88.1, 10 stands for 90, 80
+    session : requests.Session
+        (default None) Session used to perform the request; when provided, the
+        data are streamed by chunks and the connections are reused across calls
+    chunk_size : int
+        (default 64 KiB) Size of the chunks streamed when a session is used
+    timeout : float or tuple
+        (default None) Connect and read timeouts [s] of the request when a
+        session is used; None waits forever
     """
     import urllib
+    from contextlib import nullcontext
 
     from tqdm import tqdm
 
@@ -420,6 +440,34 @@ def progress_retrieve(
         pbar.n = round(count * blockSize * 100 / totalSize / roundto) * roundto
         pbar.refresh()
 
+    if session is not None:
+        method = session.get if data is None else session.post
+        # the progress bar is closed also when the request fails
+        try:
+            with method(
+                url,
+                data=data,
+                headers=dict(headers or []),
+                stream=True,
+                timeout=timeout,
+            ) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get("content-length", 0))
+                if isinstance(file, (str, os.PathLike)):
+                    file_context = open(file, "wb")
+                else:
+                    file_context = nullcontext(file)
+                with file_context as f:
+                    for count, chunk in enumerate(
+                        response.iter_content(chunk_size=chunk_size), start=1
+                    ):
+                        f.write(chunk)
+                        if total_size > 0:
+                            dlProgress(count, chunk_size, total_size)
+        finally:
+            pbar.close()
+        return
+
     if data is not None:
         data = urllib.parse.urlencode(data).encode()
 
@@ -560,7 +560,12 @@ if __name__ == "__main__":
     # filter plants for hydro
     if snakemake.wildcards.technology.startswith("hydro"):
         country_shapes = gpd.read_file(paths.country_shapes)
-        hydrobasins = gpd.read_file(resource["hydrobasins"])
+        if resource["hydrobasins"].endswith(".parquet"):
+            hydrobasins = gpd.read_parquet(resource["hydrobasins"])
+        else:
+            hydrobasins = gpd.read_file(resource["hydrobasins"])
+        # pass the loaded shapes to atlite, which would otherwise read them again
+        resource["hydrobasins"] = hydrobasins
         ppls = load_powerplants(snakemake.input.powerplants)
 
         hydro_ppls = ppls[ppls.carrier == "hydro"]
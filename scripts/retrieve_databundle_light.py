@@ -81,12 +81,26 @@ according to the following rules:
 
 """
 import datetime as dt
+import json
 import os
+import random
 import re
-from zipfile import ZipFile
-
+import shutil
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import ExitStack, contextmanager
+from itertools import chain
+from tempfile import TemporaryFile
+from zipfile import BadZipFile, ZipFile
+
+import gdown
 import geopandas as gpd
 import pandas as pd
+import pyogrio
+import requests
 import yaml
 from _helpers import (
     configure_logging,
@@ -95,11 +109,348 @@ from _helpers import (
     progress_retrieve,
     sets_path_to_root,
 )
-from google_drive_downloader import GoogleDriveDownloader as gdd
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 
 logger = create_logger(__name__)
 
+try:
+    from gdown.exceptions import FileURLRetrievalError
+except ImportError:
+    # gdown<5 returns None instead of raising when a file cannot be retrieved
+    FileURLRetrievalError = FileNotFoundError
+
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+
+class _IsalInflateZlib:
+    """
+    Proxy of the zlib module whose decompressor is the SIMD-accelerated inflate
+    of ISA-L, compatible with zlib; all the other attributes, e.g. those used
+    for compression, are the ones of zlib.
+
+    The proxy replaces the zlib global of zipfile, which relies on zipfile
+    looking the module up at every decompression, an implementation detail
+    of CPython; otherwise zlib is silently used.
+    """
+
+    def __getattr__(self, name):
+        return getattr(zlib, name)
+
+    @staticmethod
+    def decompressobj(*args, **kwargs):
+        return isal_zlib.decompressobj(*args, **kwargs)
+
+
+@contextmanager
+def _isal_inflate():
+    """
+    Context manager to let zipfile inflate the DEFLATE members with ISA-L when
+    python-isal is available; the zlib module of zipfile is restored on exit,
+    so that importing this module has no side effects.
+    """
+    if isal_zlib is None:
+        yield
+        return
+
+    zipfile_zlib = zipfile.zlib
+    zipfile.zlib = _IsalInflateZlib()
+    try:
+        yield
+    finally:
+        zipfile.zlib = zipfile_zlib
+
+
+# maximum number of hydrobasins regional files downloaded concurrently
+HYDROBASINS_MAX_WORKERS = 4
+
+# maximum number of bundles downloaded concurrently
+BUNDLE_MAX_WORKERS = 4
+
+# maximum number of threads used to extract archives, shared by all the downloads
+EXTRACT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# executor shared by all the extractions to bound the total number of threads;
+# its tasks must not submit further tasks to it, to avoid deadlocks
+_EXTRACT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=EXTRACT_MAX_WORKERS, thread_name_prefix="extract"
+)
+
+# size [bytes] of the buffer used to copy the extracted data, larger than the
+# 64 KiB default of shutil to reduce the number of read/write calls
+EXTRACT_BUFFER_SIZE = 1 << 20
+
+# file, relative to the repository root, tracking the hosts that failed to
+# provide the bundles
+DATABUNDLE_CACHE = ".databundle_cache.json"
+
+# time [s] during which a host that failed to provide a bundle is not retried
+FAILED_HOST_TTL = 3600
+
+# file id of google drive urls, e.g. https://drive.google.com/file/d/{file_id}/view
+_GDRIVE_ID_RE = re.compile(r"/(?:file/)?d/([a-zA-Z0-9_-]+)")
+
+
+def _create_session(pool_size=16):
+    """
+    Create a requests session that keeps connections alive across downloads.
+    The adapter does not retry, as the retries are handled by
+    retrieve_with_retries only.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# session shared by all the downloads to amortize the connection handshakes;
+# the pool holds a connection for every concurrent hydrobasins download of
+# every concurrent bundle
+_SESSION = _create_session(pool_size=BUNDLE_MAX_WORKERS * HYDROBASINS_MAX_WORKERS)
+
+# number of attempts to download a file when transient network errors occur
+DOWNLOAD_ATTEMPTS = 5
+
+# connect and read timeouts [s] of the requests, so that stalled connections
+# raise and are retried instead of blocking the download forever
+DOWNLOAD_TIMEOUT = (30, 120)
+
+# errors of corrupted or truncated archives and of the file system
+_EXTRACTION_ERRORS = (BadZipFile, EOFError, OSError, zlib.error) + (
+    (isal_zlib.error,) if isal_zlib is not None else ()
+)
+
+# errors for which a download from a host is considered failed
+_DOWNLOAD_ERRORS = (requests.RequestException, ValueError) + _EXTRACTION_ERRORS
+
+
+def _is_retriable(err):
+    "Checks whether a request error is transient and the request can be retried"
+
+    if isinstance(err, requests.HTTPError):
+        status = err.response.status_code if err.response is not None else None
+        return status is not None and (status == 429 or status >= 500)
+
+    return isinstance(err, (requests.ConnectionError, requests.Timeout))
+
+
+def retrieve_with_retries(
+    url, file, attempts=DOWNLOAD_ATTEMPTS, timeout=DOWNLOAD_TIMEOUT, **kwargs
+):
+    """
+    retrieve_with_retries(url, file, attempts=DOWNLOAD_ATTEMPTS,
+    timeout=DOWNLOAD_TIMEOUT, **kwargs)
+
+    Function to download data with progress_retrieve through the shared session,
+    retrying with exponential backoff when transient network errors occur,
+    including connections stalled for longer than timeout.
+    Further keyword arguments are passed to progress_retrieve.
+    """
+    for attempt in range(attempts):
+        try:
+            return progress_retrieve(
+                url, file, session=_SESSION, timeout=timeout, **kwargs
+            )
+        except requests.RequestException as err:
+            if attempt + 1 >= attempts or not _is_retriable(err):
+                raise
+
+            wait = 2**attempt + random.random()
+            logger.warning(
+                f"Attempt {attempt + 1} to download '{url}' failed ({err}): "
+                f"retrying in {wait:.1f} s"
+            )
+            time.sleep(wait)
+
+            # discard the partially downloaded data
+            if not isinstance(file, (str, os.PathLike)):
+                file.seek(0)
+                file.truncate()
+
+
+# maximum size [bytes] accepted for a downloaded archive
+ZIP_MAX_SIZE = 8 << 30
+
+
+def _validate_zip(file, max_size=ZIP_MAX_SIZE):
+    """
+    Checks that a downloaded file is a zip archive of acceptable size, to fail
+    before extraction when a host returns e.g. an html error page.
+
+    Inputs
+    ------
+    file : str or file-like
+        Path or seekable binary file object of the downloaded archive
+    max_size : int (default ZIP_MAX_SIZE)
+        Maximum size [bytes] of the archive
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return _validate_zip(f, max_size=max_size)
+
+    size = file.seek(0, os.SEEK_END)
+    if size > max_size:
+        raise ValueError(f"Archive of {size} bytes exceeds the limit of {max_size}")
+
+    file.seek(0)
+    header = file.read(4)
+    file.seek(0)
+
+    # "PK" signature of local file headers and of empty archives
+    if header[:2] != b"PK":
+        raise BadZipFile(f"Downloaded file is not a zip archive: {header!r}")
+
+
+@contextmanager
+def stream_zip(url, data=None, headers=None, disable_progress=False, tmp_dir=None):
+    """
+    stream_zip(url, data=None, headers=None, disable_progress=False,
+    tmp_dir=None)
+
+    Context manager to download a zip archive into an anonymous temporary file
+    and open it; the file is discarded when the context exits.
+    A real file is used, as SpooledTemporaryFile is not seekable for ZipFile
+    before Python 3.11.
+
+    Inputs
+    ------
+    url : str
+        Url of the zip archive
+    data : dict (default None)
+        Data for the request; when not None the post method is used
+    headers : list (default None)
+        List of (header, value) tuples to add to the request
+    disable_progress : Bool (default False)
+        When true the progress bar to download data is disabled
+    tmp_dir : str (default None)
+        Folder of the temporary file, e.g. the repository root, as the system
+        temporary folder may be too small for the archives; when None the
+        system temporary folder is used
+
+    Outputs
+    -------
+    zip_obj : ZipFile
+        Archive opened in read mode
+    """
+    with TemporaryFile(dir=tmp_dir) as buffer:
+        retrieve_with_retries(
+            url,
+            buffer,
+            data=data,
+            headers=headers,
+            disable_progress=disable_progress,
+        )
+        _validate_zip(buffer)
+        with ZipFile(buffer, "r") as zip_obj:
+            yield zip_obj
+
+
+def _member_path(zip_info, destination):
+    "Path where a zip member is extracted, discarding absolute and parent references"
+
+    arcname = os.path.splitdrive(zip_info.filename)[1].replace("/", os.path.sep)
+    parts = [part for part in arcname.split(os.path.sep) if part not in ("", ".", "..")]
+
+    return os.path.join(destination, *parts)
+
+
+def _run_extraction_tasks(func, items):
+    """
+    Run func on every item in the shared extraction executor and wait for all
+    the tasks before re-raising the first error, so that no task is still
+    writing when the caller closes the archive or moves to another host.
+    """
+    futures = [_EXTRACT_EXECUTOR.submit(func, item) for item in items]
+    wait(futures)
+
+    for future in futures:
+        future.result()
+
+
+def _extract_all(
+    zip_obj,
+    destination,
+    concurrent=True,
+    bufsize=EXTRACT_BUFFER_SIZE,
+):
+    """
+    _extract_all(zip_obj, destination, concurrent=True,
+    bufsize=EXTRACT_BUFFER_SIZE)
+
+    Function to extract all the members of a zip archive into destination.
+    The folders are created first, then the files are inflated concurrently
+    by the shared extraction executor, as zlib releases the GIL while inflating.
+
+    Inputs
+    ------
+    zip_obj : ZipFile
+        Archive opened in read mode
+    destination : str
+        Folder where to extract the archive
+    concurrent : Bool (default True)
+        When false the files are extracted sequentially in the calling thread,
+        as required when called from a task of the shared extraction executor
+    bufsize : int (default EXTRACT_BUFFER_SIZE)
+        Size of the buffer used to copy every file
+    """
+    file_infos = []
+    for zip_info in zip_obj.infolist():
+        target_path = _member_path(zip_info, destination)
+        if zip_info.is_dir():
+            os.makedirs(target_path, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+            file_infos.append((zip_info, target_path))
+
+    # the reads of the archive are serialized by ZipFile, while opening and
+    # closing the members update a shared counter and are guarded here
+    lock = threading.Lock()
+
+    def extract_member(member):
+        zip_info, target_path = member
+        with lock:
+            src = zip_obj.open(zip_info)
+        try:
+            with open(target_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, length=bufsize)
+        finally:
+            with lock:
+                src.close()
+
+    if not concurrent or len(file_infos) <= 1:
+        for member in file_infos:
+            extract_member(member)
+    else:
+        _run_extraction_tasks(extract_member, file_infos)
+
+
+def stream_extract(
+    url, destination, data=None, headers=None, disable_progress=False, tmp_dir=None
+):
+    """
+    stream_extract(url, destination, data=None, headers=None,
+    disable_progress=False, tmp_dir=None)
+
+    Function to download a zip archive into an anonymous temporary file in
+    tmp_dir and extract it into destination.
+    """
+    with stream_zip(
+        url,
+        data=data,
+        headers=headers,
+        disable_progress=disable_progress,
+        tmp_dir=tmp_dir,
+    ) as zip_obj:
+        _extract_all(zip_obj, destination)
+
 
 def load_databundle_config(config):
     "Load databundle configurations from path file or dictionary"
@@ -110,11 +461,17 @@ def load_databundle_config(config):
     elif type(config) is not dict:
         logger.error("Impossible to load the databundle configuration")
 
-    # parse the "countries" list specified in the file before processing
+    # parse the "countries" list specified in the file before processing;
+    # bundles already parsed in place by a previous call are skipped.
+    # Only json-serializable values are stored, as the databundle configuration
+    # is part of the snakemake configuration stored in the network metadata
     for bundle_name in config:
+        if config[bundle_name].get("countries_parsed", False):
+            continue
         config[bundle_name]["countries"] = create_country_list(
             config[bundle_name]["countries"], iso_coding=False
         )
+        config[bundle_name]["countries_parsed"] = True
 
     return config
 
@@ -143,22 +500,27 @@ def download_and_unzip_zenodo(config, rootpath, hot_run=True, disable_progress=F
     True when download is successful, False otherwise
     """
     resource = config["category"]
-    file_path = os.path.join(rootpath, "tempfile.zip")
     destination = os.path.relpath(config["destination"])
     url = config["urls"]["zenodo"]
 
     if hot_run:
         try:
-            logger.info(f"Downloading resource '{resource}' from cloud '{url}'")
-            progress_retrieve(url, file_path, disable_progress=disable_progress)
-            logger.info(f"Extracting resources")
-            with ZipFile(file_path, "r") as zipObj:
-                # Extract all the contents of zip file in current directory
-                zipObj.extractall(path=destination)
-            os.remove(file_path)
+            logger.info(
+                f"Downloading and extracting resource '{resource}' from cloud '{url}'"
+            )
+            stream_extract(
+                url, destination, disable_progress=disable_progress, tmp_dir=rootpath
+            )
             logger.info(f"Downloaded resource '{resource}' from cloud '{url}'.")
-        except:
-            logger.warning(f"Failed download resource '{resource}' from cloud '{url}'.")
+        except BadZipFile as err:
+            logger.warning(
+                f"Corrupted archive for resource '{resource}' from cloud '{url}': {err}"
+            )
+            return False
+        except _DOWNLOAD_ERRORS as err:
+            logger.warning(
+                f"Failed download resource '{resource}' from cloud '{url}': {err}"
+            )
             return False
 
     return True
@@ -188,53 +550,60 @@ def download_and_unzip_gdrive(config, rootpath, hot_run=True, disable_progress=F
     True when download is successful, False otherwise
     """
     resource = config["category"]
-    file_path = os.path.join(rootpath, "tempfile.zip")
     destination = os.path.relpath(config["destination"])
     url = config["urls"]["gdrive"]
 
     # retrieve file_id from path
-    # cut the part before the ending \view
-    partition_view = re.split(r"/view|\\view", str(url), 1)
-    if len(partition_view) < 2:
+    match = _GDRIVE_ID_RE.search(str(url))
+    if match is None:
         logger.error(
-            f'Resource {resource} cannot be downloaded: "\\view" not found in url {url}'
+            f"Resource {resource} cannot be downloaded: file id not found in url {url}"
         )
         return False
 
-    # split url to get the file_id
-    code_split = re.split(r"\\|/", partition_view[0])
+    file_id = match.group(1)
 
-    if len(code_split) < 2:
-        logger.error(
-            f'Resource {resource} cannot be downloaded: character "\\" not found in {partition_view[0]}'
-        )
-        return False
-
-    # get file id
-    file_id = code_split[-1]
+    # temporary file specific to the file id, as bundles may be downloaded concurrently
+    file_path = os.path.join(rootpath, f"tempfile_{file_id}.zip")
 
     # if hot run enabled
     if hot_run:
-        # remove file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-        # download file from google drive
-        gdd.download_file_from_google_drive(
-            file_id=file_id,
-            dest_path=file_path,
-            showsize=not disable_progress,
-            unzip=False,
-        )
-        with ZipFile(file_path, "r") as zipObj:
-            # Extract all the contents of zip file in current directory
-            zipObj.extractall(path=destination)
+        try:
+            # remove file
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            # download file from google drive streaming it to disk
+            logger.info(f"Downloading resource '{resource}' from cloud '{url}'.")
+            if (
+                gdown.download(id=file_id, output=file_path, quiet=disable_progress)
+                is None
+            ):
+                raise FileURLRetrievalError(
+                    f"Google drive file '{file_id}' not retrieved"
+                )
 
-        logger.info(f"Download resource '{resource}' from cloud '{url}'.")
+            _validate_zip(file_path)
+            with ZipFile(file_path, "r") as zipObj:
+                # Extract all the contents of zip file in current directory
+                _extract_all(zipObj, destination)
 
-        return True
-    else:
-        logger.error(f"Host {host} not implemented")
-        return False
+            logger.info(f"Downloaded resource '{resource}' from cloud '{url}'.")
+        except BadZipFile as err:
+            logger.warning(
+                f"Corrupted archive for resource '{resource}' from cloud '{url}': {err}"
+            )
+            return False
+        except (FileURLRetrievalError,) + _DOWNLOAD_ERRORS as err:
+            logger.warning(
+                f"Failed download resource '{resource}' from cloud '{url}': {err}"
+            )
+            return False
+        finally:
+            # remove the temporary archive, also when partially downloaded
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    return True
 
 
 def download_and_unzip_protectedplanet(
@@ -266,7 +635,6 @@ def download_and_unzip_protectedplanet(
     True when download is successful, False otherwise
     """
     resource = config["category"]
-    file_path = os.path.join(rootpath, "tempfile_wpda.zip")
     destination = os.path.relpath(config["destination"])
     url = config["urls"]["protectedplanet"]
 
@@ -282,9 +650,6 @@ def download_and_unzip_protectedplanet(
     )
 
     if hot_run:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         downloaded = False
 
         for i in range(attempts + 1):
@@ -299,48 +664,64 @@ def download_and_unzip_protectedplanet(
                 logger.info(
                     f"Downloading resource '{resource_iter}' from cloud '{url_iter}'."
                 )
-                progress_retrieve(
-                    url_iter, file_path, disable_progress=disable_progress
-                )
-
-                zip_obj = ZipFile(file_path, "r")
-
-                # list of zip files, which contains the shape files
-                zip_files = [
-                    fname for fname in zip_obj.namelist() if fname.endswith(".zip")
-                ]
-
-                # if empty, the download failed
-                if not zip_files:
-                    raise Exception(
-                        "Corrupted zip file downloaded from protectedplanet"
-                    )
-
-                # extract the nested zip files
-                for fzip in zip_files:
-                    # final path of the file
-                    try:
-                        inner_zipname = os.path.join(destination, fzip)
-
-                        zip_obj.extract(fzip, path=destination)
-
-                        dest_nested = os.path.join(destination, fzip.split(".")[0])
-
-                        with ZipFile(inner_zipname, "r") as nested_zip:
-                            nested_zip.extractall(path=dest_nested)
-
-                        # remove inner zip file
-                        os.remove(inner_zipname)
-
-                        logger.info(f"{resource} - Successfully unzipped file '{fzip}'")
-                    except:
-                        logger.warning(
-                            f"Exception while unzipping file '{fzip}' for {resource_iter}: skipped file"
+                with stream_zip(
+                    url_iter, disable_progress=disable_progress, tmp_dir=rootpath
+                ) as zip_obj:
+                    # list of zip files, which contains the shape files
+                    zip_files = [
+                        fname for fname in zip_obj.namelist() if fname.endswith(".zip")
+                    ]
+
+                    # if empty, the download failed
+                    if not zip_files:
+                        raise BadZipFile(
+                            "Corrupted zip file downloaded from protectedplanet"
                         )
 
-                # close and remove outer zip file
-                zip_obj.close()
-                os.remove(file_path)
+                    # copy the nested zip files into temporary files; the outer
+                    # archive is read sequentially as ZipFile is not thread-safe
+                    with ExitStack() as stack:
+                        nested_buffers = {}
+                        for fzip in zip_files:
+                            try:
+                                buffer = stack.enter_context(
+                                    TemporaryFile(dir=rootpath)
+                                )
+                                with zip_obj.open(fzip) as src:
+                                    shutil.copyfileobj(
+                                        src, buffer, length=EXTRACT_BUFFER_SIZE
+                                    )
+                                buffer.seek(0)
+                                nested_buffers[fzip] = buffer
+                            except _EXTRACTION_ERRORS:
+                                logger.warning(
+                                    f"Exception while reading file '{fzip}' for {resource_iter}: skipped file"
+                                )
+
+                        def extract_nested_zip(fzip):
+                            # final path of the file
+                            dest_nested = os.path.join(destination, fzip.split(".")[0])
+                            try:
+                                # the nested zip files are already extracted
+                                # by the shared executor, hence each one is
+                                # sequential
+                                with ZipFile(nested_buffers[fzip], "r") as nested_zip:
+                                    _extract_all(
+                                        nested_zip, dest_nested, concurrent=False
+                                    )
+
+                                logger.info(
+                                    f"{resource} - Successfully unzipped file '{fzip}'"
+                                )
+                            except _EXTRACTION_ERRORS:
+                                logger.warning(
+                                    f"Exception while unzipping file '{fzip}' for {resource_iter}: skipped file"
+                                )
+
+                        # extract the nested zip files concurrently: each one has
+                        # its own temporary file and destination folder
+                        os.makedirs(destination, exist_ok=True)
+                        _run_extraction_tasks(extract_nested_zip, nested_buffers)
 
                 logger.info(
                     f"Downloaded resource '{resource_iter}' from cloud '{url_iter}'."
@@ -348,7 +729,7 @@ def download_and_unzip_protectedplanet(
 
                 downloaded = True
                 break
-            except:
+            except _DOWNLOAD_ERRORS:
                 logger.warning(
                     f"Failed download resource '{resource_iter}' from cloud '{url_iter}'."
                 )
@@ -371,10 +752,11 @@ def download_and_unpack(
     hot_run=True,
     unzip=True,
     disable_progress=False,
+    tmp_dir=None,
 ):
     """
     download_and_unpack( url, file_path, resource, destination, headers=None,
-    hot_run=True, unzip=True, disable_progress=False)
+    hot_run=True, unzip=True, disable_progress=False, tmp_dir=None)
 
     A helper function to encapsulate retrieval and unzip
 
@@ -385,33 +767,50 @@ def download_and_unpack(
         When false, the workflow is run without downloading and unzipping
     disable_progress : Bool (default False)
         When true the progress bar to download data is disabled
+    tmp_dir : str (default None)
+        Folder of the temporary archive when unzip is enabled
 
     Outputs
     -------
     True when download is successful, False otherwise
     """
     if hot_run:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         try:
             logger.info(f"Downloading resource '{resource}' from cloud '{url}'.")
-            progress_retrieve(
-                url, file_path, headers=headers, disable_progress=disable_progress
-            )
 
             # if the file is a zipfile and unzip is enabled
-            # then unzip it and remove the original file
+            # then extract it from a temporary file, else store the file
             if unzip:
-                with ZipFile(file_path, "r") as zipfile:
-                    zipfile.extractall(destination)
-
-                os.remove(file_path)
+                stream_extract(
+                    url,
+                    destination,
+                    headers=headers,
+                    disable_progress=disable_progress,
+                    tmp_dir=tmp_dir,
+                )
+            else:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+                retrieve_with_retries(
+                    url,
+                    file_path,
+                    headers=headers,
+                    disable_progress=disable_progress,
+                )
             logger.info(f"Downloaded resource '{resource}' from cloud '{url}'.")
-            return True
-        except:
-            logger.warning(f"Failed download resource '{resource}' from cloud '{url}'.")
+        except BadZipFile as err:
+            logger.warning(
+                f"Corrupted archive for resource '{resource}' from cloud '{url}': {err}"
+            )
             return False
+        except _DOWNLOAD_ERRORS as err:
+            logger.warning(
+                f"Failed download resource '{resource}' from cloud '{url}': {err}"
+            )
+            return False
+
+    return True
 
 
 def download_and_unzip_direct(config, rootpath, hot_run=True, disable_progress=False):
@@ -446,13 +845,15 @@ def download_and_unzip_direct(config, rootpath, hot_run=True, disable_progress=F
 
     unzip = config.get("unzip", False)
 
-    download_and_unpack(
+    return download_and_unpack(
         url=url,
         file_path=file_path,
         resource=resource,
+        destination=destination,
         hot_run=hot_run,
         unzip=unzip,
         disable_progress=disable_progress,
+        tmp_dir=rootpath,
     )
 
 
@@ -500,13 +901,11 @@ def download_and_unzip_hydrobasins(
     level_code = snakemake.config["renewable"]["hydro"]["hydrobasins_level"]
     level_code = "{:02d}".format(int(level_code))
 
-    all_downloaded = True
-
-    for rg in suffix_list:
+    def download_suffix(rg):
         url = url_templ + "hybas_" + rg + "_lev" + level_code + "_v1c.zip"
         file_path = os.path.join(destination, os.path.basename(url))
 
-        all_downloaded &= download_and_unpack(
+        return download_and_unpack(
             url=url,
             file_path=file_path,
             resource=resource,
@@ -515,8 +914,14 @@ def download_and_unzip_hydrobasins(
             hot_run=hot_run,
             unzip=True,
             disable_progress=disable_progress,
+            tmp_dir=rootpath,
         )
 
+    # the regional files are independent, hence they are retrieved concurrently
+    # to overlap the network latency of the requests
+    with ThreadPoolExecutor(max_workers=HYDROBASINS_MAX_WORKERS) as executor:
+        all_downloaded = all(executor.map(download_suffix, suffix_list))
+
     return all_downloaded
 
 
@@ -554,26 +959,29 @@ def download_and_unzip_post(config, rootpath, hot_run=True, disable_progress=Fal
     file_path = os.path.join(destination, os.path.basename(url))
 
     if hot_run:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
         # try:
         logger.info(f"Downloading resource '{resource}' from cloud '{url}'.")
 
-        progress_retrieve(
-            url,
-            file_path,
-            data=postdata,
-            disable_progress=disable_progress,
-        )
-
         # if the file is a zipfile and unzip is enabled
-        # then unzip it and remove the original file
+        # then extract it from a temporary file, else store the file
         if config.get("unzip", False):
-            with ZipFile(file_path, "r") as zipfile:
-                zipfile.extractall(destination)
+            stream_extract(
+                url,
+                destination,
+                data=postdata,
+                disable_progress=disable_progress,
+                tmp_dir=rootpath,
+            )
+        else:
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
-            os.remove(file_path)
+            retrieve_with_retries(
+                url,
+                file_path,
+                data=postdata,
+                disable_progress=disable_progress,
+            )
         logger.info(f"Downloaded resource '{resource}' from cloud '{url}'.")
         # except:
         #     logger.warning(f"Failed download resource '{resource}' from cloud '{url}'.")
@@ -603,16 +1011,12 @@ def _check_disabled_by_opt(config_bundle, config_enable):
         ]
 
         # merge all the lists unique elements
-        all_disabled = []
-        for tot_outs in disabled_objs:
-            for out in tot_outs:
-                if out not in all_disabled:
-                    all_disabled.append(out)
+        all_disabled = set().union(*disabled_objs)
 
         if "all" in all_disabled:
             disabled_outs = ["all"]
         elif "output" in config_enable:
-            disabled_outs = list(set(all_disabled))
+            disabled_outs = list(all_disabled)
 
     return disabled_outs
 
@@ -652,43 +1056,41 @@ def get_best_bundles_by_category(
     returned_bundles : list
         List of bundles to download
     """
-    # dictionary with the number of match by configuration for tutorial/non-tutorial configurations
-    df_matches = pd.DataFrame(columns=["bundle_name", "bundle_size", "n_matched"])
-
-    for bname, bvalue in config_bundles.items():
-        if (
-            bvalue["category"] == category
-            and bvalue.get("tutorial", False) == tutorial
-            and _check_disabled_by_opt(bvalue, config_enable) != ["all"]
-        ):
-            df_matches.loc[bname] = [
-                bname,
-                len(bvalue["countries"]),
-                bvalue["n_matched"],
-            ]
-
-    df_matches["neg_bundle_size"] = -df_matches["bundle_size"]
-    df_matches.sort_values(
-        by=["n_matched", "neg_bundle_size"], inplace=True, ascending=False
+    # bundles matching the category for tutorial/non-tutorial configurations
+    matched_bundles = [
+        bname
+        for bname, bvalue in config_bundles.items()
+        if bvalue["category"] == category
+        and bvalue.get("tutorial", False) == tutorial
+        and _check_disabled_by_opt(bvalue, config_enable) != ["all"]
+    ]
+
+    # sort by decreasing number of matched countries and, for the same number
+    # of matches, by increasing bundle size
+    matched_bundles.sort(
+        key=lambda bname: (
+            -config_bundles[bname]["n_matched"],
+            len(config_bundles[bname]["countries"]),
+        )
     )
 
     returned_bundles = []
+    current_matched_countries = []
+    remaining_countries = set(country_list)
 
-    if not df_matches.empty:
-        current_matched_countries = []
-        remaining_countries = set(country_list)
+    for bname in matched_bundles:
+        # all countries are matched: no more bundles are needed
+        if not remaining_countries:
+            break
 
-        for bname in df_matches.index:
-            cbundle_list = set(config_bundles[bname]["countries"])
+        # countries in the bundle that are not yet matched
+        intersect = remaining_countries.intersection(config_bundles[bname]["countries"])
 
-            # list of countries in the bundle that are not yet matched
-            intersect = cbundle_list.intersection(remaining_countries)
+        if intersect:
+            current_matched_countries.extend(intersect)
+            remaining_countries.difference_update(intersect)
 
-            if intersect:
-                current_matched_countries.extend(intersect)
-                remaining_countries = remaining_countries.difference(intersect)
-
-                returned_bundles.append(bname)
+            returned_bundles.append(bname)
 
     return returned_bundles
 
@@ -732,10 +1134,13 @@ def get_best_bundles(countries, config_bundles, tutorial, config_enable):
         set([config_bundles[conf]["category"] for conf in config_bundles])
     )
 
-    # identify matched countries for every bundle
+    countries_set = frozenset(countries)
+
+    # identify matched countries for every bundle; the hashed lookup is local,
+    # while a json-serializable list is stored in the configuration
     for bname in config_bundles:
         config_bundles[bname]["matched_countries"] = [
-            c for c in config_bundles[bname]["countries"] if c in countries
+            c for c in config_bundles[bname]["countries"] if c in countries_set
         ]
         n_matched = len(config_bundles[bname]["matched_countries"])
         config_bundles[bname]["n_matched"] = n_matched
@@ -761,6 +1166,108 @@ def get_best_bundles(countries, config_bundles, tutorial, config_enable):
     return bundles_to_download
 
 
+def load_databundle_cache(cache_path):
+    "Load the hosts that failed in the previous runs; empty when missing or corrupted"
+
+    if not os.path.isfile(cache_path):
+        return {}
+
+    try:
+        with open(cache_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        logger.warning(f"Databundle cache '{cache_path}' cannot be read: ignored")
+        return {}
+
+
+def save_databundle_cache(cache, cache_path):
+    "Store the hosts that failed to provide the bundles, replacing the file atomically"
+
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(cache, file, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def _bundle_outputs(config_bundle):
+    "Outputs of the bundle that can be checked on disk, i.e. without wildcards"
+
+    return [
+        output
+        for output in config_bundle.get("output", [])
+        if "*" not in output or output.endswith("/")  # exclude directories
+    ]
+
+
+def is_host_failed_recently(bundle_name, host, cache, ttl=FAILED_HOST_TTL):
+    "Checks whether the host failed to provide the bundle in the last ttl seconds"
+
+    failed_ts = cache.get(bundle_name, {}).get("failed_hosts", {}).get(host)
+
+    return failed_ts is not None and time.time() - failed_ts < ttl
+
+
+def _download_bundle(
+    b_name,
+    config_bundle,
+    rootpath,
+    cache,
+    disable_progress=False,
+    failed_host_ttl=FAILED_HOST_TTL,
+):
+    """
+    _download_bundle(b_name, config_bundle, rootpath, cache,
+    disable_progress=False, failed_host_ttl=FAILED_HOST_TTL)
+
+    Function to download a bundle trying its hosts in order, until the data
+    are successfully downloaded. The cache is only read, to skip the hosts
+    that failed in the last failed_host_ttl seconds; when all the hosts
+    failed recently, all of them are tried anyway.
+
+    Outputs
+    -------
+    status : Dict
+        Status of the download, with the successful host, if any, and the
+        hosts that failed in this call
+    """
+    host_list = config_bundle["urls"]
+    failed_hosts = {}
+
+    recently_failed = [
+        host
+        for host in host_list
+        if is_host_failed_recently(b_name, host, cache, ttl=failed_host_ttl)
+    ]
+    if recently_failed and len(recently_failed) == len(host_list):
+        logger.info(f"All hosts failed recently for bundle {b_name}: retrying all")
+        recently_failed = []
+
+    # loop all hosts until data is successfully downloaded
+    for host in host_list:
+        if host in recently_failed:
+            logger.info(f"Host {host} failed recently for bundle {b_name}: skipped")
+            continue
+
+        logger.info(f"Downloading bundle {b_name} - Host {host}")
+
+        downloaded_bundle = False
+        try:
+            download_and_unzip = globals()[f"download_and_unzip_{host}"]
+            if download_and_unzip(
+                config_bundle, rootpath, disable_progress=disable_progress
+            ):
+                downloaded_bundle = True
+        except Exception:
+            logger.warning(f"Error in downloading bundle {b_name} - host {host}")
+
+        if downloaded_bundle:
+            return {"ok": True, "host": host, "failed_hosts": failed_hosts}
+
+        failed_hosts[host] = time.time()
+
+    return {"ok": False, "host": None, "failed_hosts": failed_hosts}
+
+
 def datafiles_retrivedatabundle(config):
     """
     Function to get the output files from the bundles, given the target
@@ -777,38 +1284,70 @@ def datafiles_retrivedatabundle(config):
         countries, config_bundles, tutorial, config_enable
     )
 
-    listoutputs = list(
-        set(
-            [
-                inneroutput
-                for bundlename in bundles_to_download
-                for inneroutput in config["databundles"][bundlename]["output"]
-                if "*" not in inneroutput
-                or inneroutput.endswith("/")  # exclude directories
-            ]
+    listoutputs = set(
+        chain.from_iterable(
+            _bundle_outputs(config_bundles[bundlename])
+            for bundlename in bundles_to_download
         )
     )
 
-    return listoutputs
+    return list(listoutputs)
 
 
-def merge_hydrobasins_shape(config_hydrobasin, hydrobasins_level):
+def merge_hydrobasins_shape(config_hydrobasin, hydrobasins_level, legacy_shp=False):
+    """
+    merge_hydrobasins_shape(config_hydrobasin, hydrobasins_level,
+    legacy_shp=False)
+
+    Function to merge the regional hydrobasins shapefiles into a single
+    GeoParquet file, compressed with zstd.
+
+    Inputs
+    ------
+    config_hydrobasin : Dict
+        Configuration data of the hydrobasins bundle
+    hydrobasins_level : int
+        Level of the hydrobasins to merge
+    legacy_shp : Bool (default False)
+        When true, the merged data are also written as shapefile
+        next to the GeoParquet output
+    """
     basins_path = config_hydrobasin["destination"]
     output_fl = config_hydrobasin["output"][0]
 
     files_to_merge = [
-        "hybas_{0:s}_lev{1:02d}_v1c.shp".format(suffix, hydrobasins_level)
+        os.path.join(
+            basins_path,
+            "hybas_{0:s}_lev{1:02d}_v1c.shp".format(suffix, hydrobasins_level),
+        )
         for suffix in config_hydrobasin["urls"]["hydrobasins"]["suffixes"]
     ]
 
-    gpdf_list = [None] * len(files_to_merge)
     logger.info("Merging hydrobasins files into: " + output_fl)
-    for i, f_name in tqdm(enumerate(files_to_merge)):
-        gpdf_list[i] = gpd.read_file(os.path.join(basins_path, f_name))
-    fl_merged = gpd.GeoDataFrame(pd.concat(gpdf_list)).drop_duplicates(
-        subset="HYBAS_ID", ignore_index=True
+
+    # read the regional files concurrently; GDAL releases the GIL while reading
+    with ThreadPoolExecutor(max_workers=HYDROBASINS_MAX_WORKERS) as executor:
+        gpdf_list = list(
+            tqdm(
+                executor.map(pyogrio.read_dataframe, files_to_merge),
+                total=len(files_to_merge),
+            )
+        )
+    crs = gpdf_list[0].crs
+    fl_merged = gpd.GeoDataFrame(
+        pd.concat(gpdf_list, ignore_index=True, sort=False, copy=False), crs=crs
     )
-    fl_merged.to_file(output_fl, driver="ESRI Shapefile")
+    # release the regional frames so that only the merged copy is kept in memory
+    gpdf_list.clear()
+    fl_merged.drop_duplicates(subset="HYBAS_ID", ignore_index=True, inplace=True)
+    fl_merged.to_parquet(output_fl, compression="zstd")
+
+    if legacy_shp:
+        pyogrio.write_dataframe(
+            fl_merged,
+            os.path.splitext(output_fl)[0] + ".shp",
+            driver="ESRI Shapefile",
+        )
 
 
 if __name__ == "__main__":
@@ -830,6 +1369,10 @@ if __name__ == "__main__":
     disable_progress = not snakemake.config.get("retrieve_databundle", {}).get(
         "show_progress", True
     )
+    # time [s] during which failed hosts are skipped; 0 always retries them
+    failed_host_ttl = snakemake.config.get("retrieve_databundle", {}).get(
+        "failed_host_ttl", FAILED_HOST_TTL
+    )
 
     # load enable configuration
     config_enable = snakemake.config["enable"]
@@ -850,43 +1393,65 @@ if __name__ == "__main__":
 
     logger.info("Bundles to be downloaded:\n\t" + "\n\t".join(bundles_to_download))
 
-    # initialize downloaded and missing bundles
-    downloaded_bundles = []
-
-    # download the selected bundles
-    for b_name in bundles_to_download:
-        host_list = config_bundles[b_name]["urls"]
-
-        downloaded_bundle = False
+    # load the hosts that failed in the previous runs
+    cache_path = os.path.join(rootpath, DATABUNDLE_CACHE)
+    cache = load_databundle_cache(cache_path)
 
-        # loop all hosts until data is successfully downloaded
-        for host in host_list:
-            logger.info(f"Downloading bundle {b_name} - Host {host}")
+    # initialize downloaded bundles
+    downloaded_bundles = []
 
-            try:
-                download_and_unzip = globals()[f"download_and_unzip_{host}"]
-                if download_and_unzip(
-                    config_bundles[b_name], rootpath, disable_progress=disable_progress
-                ):
-                    downloaded_bundle = True
-            except Exception:
-                logger.warning(f"Error in downloading bundle {b_name} - host {host}")
-
-            if downloaded_bundle:
+    # the bundles are independent, hence they are downloaded concurrently
+    with _isal_inflate(), ThreadPoolExecutor(
+        max_workers=BUNDLE_MAX_WORKERS
+    ) as executor:
+        futures = {
+            executor.submit(
+                _download_bundle,
+                b_name,
+                config_bundles[b_name],
+                rootpath,
+                cache,
+                disable_progress=disable_progress,
+                failed_host_ttl=failed_host_ttl,
+            ): b_name
+            for b_name in bundles_to_download
+        }
+
+        for future in as_completed(futures):
+            b_name = futures[future]
+            status = future.result()
+
+            # the cache is only updated here, in the main thread; the hosts
+            # that failed before the successful one keep their markers, so
+            # that the next runs go straight to the working host until the
+            # markers expire
+            previous_failed_hosts = cache.get(b_name, {}).get("failed_hosts", {})
+            failed_hosts = {
+                host: failed_ts
+                for host, failed_ts in previous_failed_hosts.items()
+                if time.time() - failed_ts < failed_host_ttl
+            }
+            failed_hosts.update(status["failed_hosts"])
+            if status["ok"]:
                 downloaded_bundles.append(b_name)
-                break
+                failed_hosts.pop(status["host"], None)
+            else:
+                logger.error(f"Bundle {b_name} cannot be downloaded")
+            cache[b_name] = {"failed_hosts": failed_hosts}
 
-        if not downloaded_bundle:
-            logger.error(f"Bundle {b_name} cannot be downloaded")
+            # checkpoint the status after every bundle
+            save_databundle_cache(cache, cache_path)
 
     hydrobasin_bundles = [
         b_name for b_name in bundles_to_download if "hydrobasins" in b_name
     ]
     if len(hydrobasin_bundles) > 0:
-        logger.info("Merging regional hydrobasins files into a global shapefile")
+        logger.info("Merging regional hydrobasins files into a global file")
         hydrobasins_level = snakemake.params["hydrobasins_level"]
         merge_hydrobasins_shape(
-            config_bundles[hydrobasin_bundles[0]], hydrobasins_level
+            config_bundles[hydrobasin_bundles[0]],
+            hydrobasins_level,
+            legacy_shp=config_enable.get("legacy_shp", False),
         )
 
     # log the downloaded and missing bundles